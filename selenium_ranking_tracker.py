@@ -1,34 +1,276 @@
 #!/usr/bin/env python3
 """
 Selenium-based Google Search Ranking Tracker
-A solution that uses Selenium WebDriver to handle JavaScript-heavy Google pages.
+Fetches Google result pages over plain async HTTP, with an optional Selenium
+WebDriver fallback (--browser) for pages that need a real browser, e.g. captchas.
 """
 
 import argparse
+import asyncio
+import atexit
+import contextlib
 import csv
 import json
 import logging
+import multiprocessing
+import os
+import queue
 import random
 import re
+import socket
+import sqlite3
+import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from http.cookies import Morsel
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, List, Optional, Tuple
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from urllib.parse import urlparse
+import aiohttp
+from aiolimiter import AsyncLimiter
+from selectolax.parser import HTMLParser
+from urllib.parse import parse_qsl, urlparse, urlsplit
+
+# Selenium is only needed for the --browser fallback (e.g. solving captchas);
+# webdriver-manager is imported lazily, only where the chromedriver path is resolved
+try:
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+except ImportError:
+    webdriver = None
+
+
+# Header set sent with plain HTTP SERP requests, matching the browser profile
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'fa,en-US;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Organic result containers across Google layouts
+RESULT_SELECTOR = 'div.g, div.tF2Cxc, div.MjjYud'
+
+# Badge texts that mark a sponsored block rather than an organic result
+AD_LABELS = ('ad', 'ads', 'sponsored')
+
+# Organic containers in one query: a result class, a title and a link, and no ad badge
+ORGANIC_XPATH = (
+    "//div[(contains(concat(' ', normalize-space(@class), ' '), ' g ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' tF2Cxc ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' MjjYud '))"
+    " and .//h3 and .//a[@href]"
+    " and not(.//span[" + " or ".join(
+        f"translate(normalize-space(.), 'ADSPONRE', 'adsponre')='{label}'" for label in AD_LABELS
+    ) + "])]"
+)
+
+# Collects organic results in-page so the browser path needs a single WebDriver call.
+# Containers nest in newer layouts, hence the de-duplication by link.
+EXTRACT_RESULTS_JS = """
+const out = [];
+const seen = new Set();
+const nodes = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let i = 0; i < nodes.snapshotLength; i++) {
+    const el = nodes.snapshotItem(i);
+    const a = el.querySelector('a[href]');
+    if (seen.has(a.href)) continue;
+    seen.add(a.href);
+    out.push({title: el.querySelector('h3').innerText.trim(), url: a.href});
+}
+return JSON.stringify(out);
+"""
+
+# Any character of the Arabic block marks a Persian keyword
+_PERSIAN_RE = re.compile('[\u0600-\u06FF]')
+
+# Google's message when a query has no (more) matching results, for both interface
+# languages searched with (hl=en and hl=fa)
+NO_RESULTS_INDICATORS = (
+    "did not match any documents",
+    "با هیچ سندی مطابقت",
+)
+_NO_RESULTS_RE = re.compile('|'.join(map(re.escape, NO_RESULTS_INDICATORS)), re.IGNORECASE)
+
+# The same check run in the browser on the live page, given the lowercased indicators
+NO_RESULTS_JS = """
+const text = document.body === null ? '' : document.body.textContent.toLowerCase();
+return arguments[0].some(m => text.includes(m));
+"""
+
+# Set on the old page before navigating; a new document starts without it
+MARK_STALE_JS = "window.__grtStale = true;"
+
+# True once a new document (not the stale page) is parsed and has result containers
+# or the no-results message; subresources and the load event are not waited for
+RESULTS_READY_JS = """
+return window.__grtStale === undefined
+    && document.readyState !== 'loading'
+    && (document.querySelector(arguments[0]) !== null
+        || arguments[1].some(m => document.body !== null && document.body.textContent.includes(m)));
+"""
+
+# Textual signals that a page is a captcha challenge
+CAPTCHA_INDICATORS = (
+    "captcha",
+    "robot verification",
+    "verify you are human",
+    "security check",
+    "recaptcha",
+    "select all images",
+    "i'm not a robot",
+    "are you a robot"
+)
+
+# Textual signals of Google's anti-bot interstitials
+ANTI_BOT_INDICATORS = (
+    "If you're having trouble accessing Google Search",
+    "enable JavaScript",
+    "unusual traffic",
+    "captcha",
+    "Please click here",
+    "robot verification",
+    "verify you are human",
+    "security check",
+    "automated queries"
+)
+
+# Each indicator list compiled into one case-insensitive pattern, so a page is scanned once
+_CAPTCHA_RE = re.compile('|'.join(map(re.escape, CAPTCHA_INDICATORS)), re.IGNORECASE)
+_ANTI_BOT_RE = re.compile('|'.join(map(re.escape, ANTI_BOT_INDICATORS)), re.IGNORECASE)
+
+# Captcha iframes and widgets, matched in a single element lookup
+CAPTCHA_WIDGET_SELECTOR = ', '.join((
+    'iframe[title*="recaptcha" i]', 'iframe[src*="recaptcha" i]',
+    '#captcha', '#g-recaptcha', '.g-recaptcha', 'div[role="dialog"][aria-modal="true"]'
+))
+
+# Buttons of Google's consent banner
+CONSENT_BUTTON_XPATH = "//button[@aria-label='Accept all' or contains(., 'I agree') or contains(., 'Accept all')]"
+
+# Subresources and telemetry beacons blocked in browser mode except while a captcha is being solved
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.webp', '*.gif', '*.svg',
+    '*.woff*', '*.css',
+    '*/gen_204*', '*/log?*',
+]
+
+# Per-host request budget as (burst size, seconds to refill the burst)
+RATE_LIMITS = {
+    'www.google.com': (3, 4.5),  # ~1 request / 1.5 s on average
+    'www.googleapis.com': (5, 1.0),
+}
+DEFAULT_RATE_LIMIT = (3, 4.5)
+
+# Google Custom Search JSON API, used when GOOGLE_CSE_KEY and GOOGLE_CSE_CX are set
+CSE_API_URL = 'https://www.googleapis.com/customsearch/v1'
+
+# On-disk SERP cache, so reruns on the same day skip unchanged lookups
+SERP_CACHE_FILE = os.path.expanduser('~/.cache/grt/serp_cache.sqlite')
+SERP_CACHE_TTL = 12 * 3600
+
+# Where the resolved chromedriver path is remembered between runs
+DRIVER_PATH_CACHE = os.path.expanduser('~/.cache/grt/chromedriver_path')
+
+# The browser is pinned to the Google address resolved when it starts
+GOOGLE_HOST = 'www.google.com'
+
+
+_log_listener: Optional[QueueListener] = None
+
+
+def _setup_logging():
+    """Send log records through a queue to the file and console, written on a listener thread.
+
+    Done once per process, and only if logging isn't configured already.
+    """
+    global _log_listener
+    if _log_listener is not None or logging.getLogger().handlers:
+        return
+    log_queue = queue.Queue()
+    _log_listener = QueueListener(
+        log_queue,
+        logging.FileHandler('selenium_ranking_tracker.log', encoding='utf-8'),
+        logging.StreamHandler(sys.stdout),
+        respect_handler_level=True
+    )
+    _log_listener.start()
+    # Stopping drains the queue, so records are written even if a tracker never gets cleaned up
+    atexit.register(_log_listener.stop)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[QueueHandler(log_queue)]
+    )
+
+
+async def _run_in_daemon_thread(func, *args):
+    """Run a blocking call in a daemon thread; unlike asyncio.to_thread, an abandoned call can't delay exit."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result, error):
+        if future.done():
+            return
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def run():
+        try:
+            result, error = func(*args), None
+        except BaseException as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            # The loop closed while the call was running
+            pass
+
+    threading.Thread(target=run, daemon=True).start()
+    return await future
+
+
+def _csv_field(value) -> str:
+    """Format a CSV field, quoting it only when it contains special characters."""
+    text = str(value)
+    if any(char in text for char in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+@lru_cache(maxsize=4096)
+def _normalize_host(host: str) -> str:
+    """Return a host or URL's lower-cased, IDNA-encoded host without 'www.'."""
+    host = host.strip().lower()
+    if host.startswith('http://') or host.startswith('https://'):
+        host = urlparse(host).netloc
+    host = host.removeprefix('www.')
+    if not host.isascii():
+        try:
+            host = host.encode('idna').decode('ascii')
+        except UnicodeError:
+            pass
+    return host
 
 
 class SeleniumRankingTracker:
     """Selenium-based Google search ranking tracker."""
     
-    def __init__(self, target_url: str, output_file: str = "results.csv", debug_mode: bool = False):
+    def __init__(self, target_url: str, output_file: str = "results.csv", debug_mode: bool = False,
+                 browser: bool = False, refresh_driver: bool = False, api: bool = False,
+                 cache: bool = True, workers: int = 1, driver_path: Optional[str] = None):
         """
         Initialize the ranking tracker.
         
@@ -36,51 +278,94 @@ class SeleniumRankingTracker:
             target_url: The website URL to track (e.g., 'example.com')
             output_file: Output CSV file path
             debug_mode: Enable debug mode
+            browser: Drive a real Chrome browser instead of plain HTTP requests
+            refresh_driver: Ignore the cached chromedriver path and resolve it again
+            api: Query the Custom Search JSON API instead of scraping result pages
+            cache: Reuse result pages fetched earlier today from the on-disk cache
+            workers: Number of Chrome processes to search with in browser mode
+            driver_path: Chromedriver to use as is, skipping the cached path check
         """
         self.target_url = target_url.lower().replace('www.', '').replace('http://', '').replace('https://', '')
+        # Canonical target host, compared against each result's pre-computed host
+        self._target_host = _normalize_host(self.target_url).rstrip('/')
         self.output_file = output_file
         self.debug_mode = debug_mode
+        self.refresh_driver = refresh_driver
         self.driver = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._limiters: Dict[str, AsyncLimiter] = {}
+        self._rate_share = 1
+        # Pool workers have no usable stdin, so they poll for a solved captcha unprompted
+        self._interactive = True
+        self._csv_fh = None
+        self._csv_lock = None
+        self._captcha_solved = False
+        # Created on first use, inside the running event loop
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._http_open: Optional[asyncio.Event] = None
+        # Tells a captcha being solved on the fallback thread to give up
+        self._stop_solving = threading.Event()
+        self._cache: Optional[sqlite3.Connection] = None
         
         self.setup_logging()
-        self.setup_driver()
+        
+        # The API path is picked automatically when credentials are configured
+        self.api_key = os.environ.get('GOOGLE_CSE_KEY')
+        self.api_cx = os.environ.get('GOOGLE_CSE_CX')
+        if api and not (self.api_key and self.api_cx):
+            raise ValueError("API mode requires GOOGLE_CSE_KEY and GOOGLE_CSE_CX environment variables")
+        self.use_api = api or (bool(self.api_key and self.api_cx) and not browser)
+        
+        # In HTTP mode the browser is only started if a captcha needs solving
+        self.browser = browser and not self.use_api
+        self._browser_failed = False
+        self._tabs: List[str] = []
+        self._page_source_cache: Optional[Tuple[str, str]] = None
+        self._driver_path = driver_path
+        # With several workers each process starts its own browser instead
+        self.workers = max(1, workers)
+        if self.browser and self.workers == 1:
+            self.setup_driver()
         
         # Search settings
         self.results_per_page = 10
         self.max_pages = 10
         self.min_delay = 3
         self.max_delay = 7
+        self.concurrency = 5
+        self.browser_tabs = 3
         
-        self.logger.info(f"Tracker initialized for target URL: {self.target_url}")
-        self.logger.info(f"Output will be saved to: {self.output_file}")
+        self.logger.info("Tracker initialized for target URL: %s", self.target_url)
+        self.logger.info("Output will be saved to: %s", self.output_file)
+
+        if cache:
+            try:
+                self._open_cache()
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning("SERP cache disabled: %s", e)
 
         # Ensure CSV exists with header for reliability
         try:
             self._ensure_csv_header()
         except Exception as e:
-            self.logger.warning(f"Could not pre-create CSV header: {e}")
+            self.logger.warning("Could not pre-create CSV header: %s", e)
 
         # Random seed per run to vary behavior
         self._human_seed = random.randint(1, 10_000_000)
     
     def setup_logging(self):
-        """Setup logging configuration."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('selenium_ranking_tracker.log', encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        """Setup logging configuration; file and console writes happen on a listener thread."""
+        _setup_logging()
         self.logger = logging.getLogger(__name__)
     
     def setup_driver(self):
         """Setup Chrome WebDriver with enhanced anti-detection options."""
+        if webdriver is None:
+            raise RuntimeError("Browser mode requires selenium and webdriver-manager to be installed")
         chrome_options = Options()
-        # Faster loads, don't wait for subresources
+        # Return as soon as navigation starts; _wait_for_results waits for the containers
         try:
-            chrome_options.page_load_strategy = 'eager'
+            chrome_options.page_load_strategy = 'none'
         except Exception:
             pass
         
@@ -126,7 +411,14 @@ class SeleniumRankingTracker:
         # Language headers to match requested hl
         chrome_options.add_argument('--lang=fa,en-US;q=0.9')
         
-        # Allow images and cookies so CAPTCHAs can load properly
+        # Skip the DNS lookup on every navigation by pinning Google's address; the pin
+        # lasts for this browser's lifetime, a restarted browser resolves it again
+        google_ip = self._resolve_google_ip()
+        if google_ip:
+            chrome_options.add_argument(f'--host-resolver-rules=MAP {GOOGLE_HOST} {google_ip}')
+        
+        # Allow images and cookies so CAPTCHAs can load properly; heavy resources are
+        # blocked over CDP instead, which can be lifted while a captcha is on screen
         prefs = {
             "profile.managed_default_content_settings.images": 1,
             "profile.default_content_setting_values.images": 1,
@@ -149,7 +441,7 @@ class SeleniumRankingTracker:
         
         try:
             # Use webdriver-manager for automatic ChromeDriver management
-            service = Service(ChromeDriverManager().install())
+            service = Service(self._resolve_driver_path())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             try:
                 self.driver.set_page_load_timeout(30)
@@ -167,20 +459,76 @@ class SeleniumRankingTracker:
                 Object.defineProperty(navigator, 'deviceMemory', {get: () => 8});
             """)
             
+            # Result pages only need their HTML; skip images, fonts and stylesheets
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self._set_resource_blocking(True)
+            
             self.logger.info("Chrome WebDriver initialized successfully")
             
         except WebDriverException as e:
-            self.logger.error(f"Failed to initialize Chrome WebDriver: {e}")
+            self.logger.error("Failed to initialize Chrome WebDriver: %s", e)
             self.logger.error("Please ensure Chrome and ChromeDriver are installed")
             raise
     
-    def search_google(self, keyword: str, max_pages: int = 10) -> List[Dict]:
+    def _resolve_google_ip(self) -> Optional[str]:
+        """Resolve Google's address for pinning it in the browser; None if the lookup fails."""
+        try:
+            return socket.gethostbyname(GOOGLE_HOST)
+        except OSError as e:
+            # Leave name resolution to Chrome
+            self.logger.warning("Could not resolve %s: %s", GOOGLE_HOST, e)
+            return None
+
+    def _resolve_driver_path(self) -> str:
+        """Return the chromedriver path, reusing the cached one while it matches Chrome."""
+        if self._driver_path:
+            return self._driver_path
+        if not self.refresh_driver:
+            self._driver_path = self._cached_driver_path()
+            if self._driver_path:
+                self.logger.info("Using cached ChromeDriver: %s", self._driver_path)
+                return self._driver_path
+        
+        from webdriver_manager.chrome import ChromeDriverManager
+        self._driver_path = ChromeDriverManager().install()
+        try:
+            os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+            with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+                f.write(self._driver_path)
+        except OSError as e:
+            self.logger.warning("Could not cache ChromeDriver path: %s", e)
+        return self._driver_path
+
+    def _cached_driver_path(self) -> Optional[str]:
+        """Return the cached chromedriver path if it is executable and matches Chrome's major version."""
+        try:
+            with open(DRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+                driver_path = f.read().strip()
+        except OSError:
+            return None
+        if not driver_path or not os.access(driver_path, os.X_OK):
+            return None
+        
+        try:
+            from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+            output = subprocess.run([driver_path, '--version'], capture_output=True, text=True, timeout=10).stdout
+            match = re.search(r'(\d+)\.', output)
+            chrome_version = OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+            if not match or not chrome_version or chrome_version.split('.')[0] != match.group(1):
+                return None
+        except Exception as e:
+            self.logger.debug("Cached ChromeDriver check failed: %s", e)
+            return None
+        return driver_path
+    
+    async def search_google(self, keyword: str, max_pages: int = 10, tab: Optional[str] = None) -> List[Dict]:
         """
-        Search Google for a keyword using Selenium.
+        Search Google for a keyword, over HTTP or through the browser fallback.
         
         Args:
             keyword: Search keyword
             max_pages: Maximum number of pages to search
+            tab: Browser window handle reserved for this keyword (browser mode)
             
         Returns:
             List of search result dictionaries
@@ -196,103 +544,432 @@ class SeleniumRankingTracker:
                 search_url = f"https://www.google.com/search?q={keyword}&start={start}&num={self.results_per_page}"
                 
                 # Add Persian language parameters if needed
-                if any('\u0600' <= char <= '\u06FF' for char in keyword):
-                    search_url += "&hl=fa&lr=lang_fa"
-                else:
-                    search_url += "&hl=en&lr=lang_en"
+                language = self._language(keyword)
+                search_url += f"&hl={language}&lr=lang_{language}"
                 
-                self.logger.info(f"Searching for '{keyword}' - Page {page + 1}")
-                self.logger.info(f"URL: {search_url}")
+                self.logger.info("Searching for '%s' - Page %d", keyword, page + 1)
+                self.logger.info("URL: %s", search_url)
                 
-                # Navigate to Google search (with retry)
-                if not self._safe_get(search_url):
-                    self.logger.error("Failed to navigate after retries; skipping this page")
-                    continue
-                
-                # Wait for page to load
-                time.sleep(random.uniform(self.min_delay, self.max_delay))
-                self._humanize_page_interaction()
-
-                # Handle Google consent banner if present (first page attempts)
-                try:
-                    self._accept_consent_if_present()
-                except Exception as e:
-                    self.logger.debug(f"Consent handling skipped/failed: {e}")
-                
-                # Check if we got a captcha or anti-bot page
-                if self.is_captcha_page():
-                    self.logger.warning("Captcha detected, handling...")
-                    if not self.handle_captcha():
-                        self.logger.error("Failed to handle captcha, skipping this page")
-                        continue
-                elif self.is_anti_bot_page():
-                    self.logger.warning("Detected anti-bot page, waiting longer...")
-                    time.sleep(random.uniform(10, 20))
-                    
-                    # Try to click the "click here" link if present
-                    try:
-                        click_here_link = self.driver.find_element(By.PARTIAL_LINK_TEXT, "click here")
-                        if click_here_link:
-                            click_here_link.click()
-                            time.sleep(random.uniform(5, 10))
-                    except:
-                        pass
+                is_captcha = False
+                cache_key = self._cache_key('serp', keyword, page)
+                page_results = self._cache_get(cache_key)
+                from_cache = page_results is not None
+                if from_cache:
+                    self.logger.info("Using cached results for page %d", page + 1)
+                elif self.browser:
+                    async with self._limiter(search_url):
+                        page_results = await self._search_page_in_tab(search_url, keyword, tab)
+                else:
+                    if self._http_open is not None:
+                        await self._http_open.wait()
+                    html, is_captcha = await self._fetch(search_url)
+                    if not is_captcha and html is not None:
+                        page_results = self._parse_html(html)
+                        # Captcha, anti-bot and JavaScript walls parse to nothing; checked only then,
+                        # since normal result pages carry some of the same phrases in <noscript>
+                        # or echo them from the query
+                        if not page_results and self._has_captcha_text(html):
+                            self.logger.warning("Captcha page served over HTTP for '%s'", keyword)
+                            is_captcha = True
+                        elif not page_results and _ANTI_BOT_RE.search(html):
+                            self.logger.warning("Anti-bot page served over HTTP for '%s'", keyword)
+                            is_captcha = True
+                    else:
+                        page_results = None
+                    if is_captcha:
+                        page_results = await self._solve_in_browser(search_url, keyword)
                 
-                # Wait for search results to load (resilient)
-                if not self._wait_for_results():
-                    self.logger.warning("Timeout waiting for search results; skipping page")
+                if page_results is None:
                     continue
-                
-                # Parse results from current page (organic only)
-                page_results = self.parse_search_results(keyword)
 
                 # Assign absolute ranks across pages
                 for index_on_page, result in enumerate(page_results, 1):
                     absolute_rank = page * self.results_per_page + index_on_page
                     result['rank'] = absolute_rank
                     all_results.append(result)
+                if page_results and not from_cache:
+                    self._cache_put(cache_key, page_results)
                 
-                self.logger.info(f"Found {len(page_results)} organic results on page {page + 1}")
+                self.logger.info("Found %d organic results on page %d", len(page_results), page + 1)
                 
                 # Check if we found our target URL on this page (hostname match)
-                for result in page_results:
-                    if self._is_target_url(result['url']):
-                        # Append immediately for reliability
-                        try:
-                            found_rank = result['rank']
-                            found_page = page + 1
-                            self.append_result_to_csv(keyword, found_rank, found_page, result['url'])
-                        except Exception as e:
-                            self.logger.warning(f"Append on-find failed: {e}")
-                        self.logger.info(f"Found target URL at absolute rank {result['rank']}")
-                        return all_results
+                if self._record_target_hit(keyword, page, page_results):
+                    return all_results
+                
+                # Google says there is nothing past this page; fallback pages are skipped since
+                # the driver belongs to the fallback thread, and an empty page stops below anyway
+                if not (from_cache or is_captcha) and self._reached_end(None if self.browser else html, tab):
+                    self.logger.info("No more results for '%s'", keyword)
+                    break
                 
                 # If we have fewer results than expected, we might be at the end
                 if len(page_results) < 5:
                     self.logger.info("Few results found, might be at end of search results")
                     break
                 
-                # Random delay between pages
-                time.sleep(random.uniform(self.min_delay, self.max_delay))
-                self._humanize_between_pages()
+                # Requests are paced by the rate limiter; this is only a short human-like jitter
+                if self.browser and not from_cache and page < max_pages - 1:
+                    await asyncio.sleep(random.uniform(0.3, 0.8))
+                    # Other keywords may have used the browser meanwhile
+                    self._switch_tab(tab)
+                    self._humanize_between_pages()
                 
             except Exception as e:
-                self.logger.error(f"Error searching page {page + 1}: {e}")
+                self.logger.error("Error searching page %d: %s", page + 1, e)
                 continue
         
         return all_results
+
+    def _reached_end(self, html: Optional[str], tab: Optional[str] = None) -> bool:
+        """Check a result page for Google's no-results message; without html the browser's tab is checked."""
+        if html is not None:
+            return _NO_RESULTS_RE.search(html) is not None
+        # Checked on the live page, since the last fetched source may predate the
+        # consent click or the final wait for results
+        try:
+            self._switch_tab(tab)
+            indicators = [indicator.lower() for indicator in NO_RESULTS_INDICATORS]
+            return bool(self.driver.execute_script(NO_RESULTS_JS, indicators))
+        except WebDriverException as e:
+            self.logger.debug("End-of-results check failed: %s", e)
+            return False
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the pooled keep-alive HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, limit_per_host=4, keepalive_timeout=75, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=15),
+                headers=DEFAULT_HEADERS,
+                # Send cookie values unquoted, as the browser does, so copied Google cookies stay valid
+                cookie_jar=aiohttp.CookieJar(quote_cookie=False),
+            )
+        return self._session
+
+    async def search_api(self, keyword: str, max_pages: int = 10) -> List[Dict]:
+        """
+        Search Google for a keyword through the Custom Search JSON API.
+        
+        Args:
+            keyword: Search keyword
+            max_pages: Maximum number of pages to search
+            
+        Returns:
+            List of search result dictionaries
+        """
+        all_results = []
+        session = await self._ensure_session()
+        language = self._language(keyword)
+        
+        # The API serves at most 100 results, 10 per request
+        for page in range(min(max_pages, 10)):
+            start = page * self.results_per_page
+            params = {
+                'key': self.api_key,
+                'cx': self.api_cx,
+                'q': keyword,
+                'num': self.results_per_page,
+                'start': start + 1,
+                'hl': language,
+                'lr': f'lang_{language}',
+            }
+            
+            self.logger.info("Searching for '%s' via API - Page %d", keyword, page + 1)
+            
+            cache_key = self._cache_key('api', keyword, page)
+            page_results = self._cache_get(cache_key)
+            if page_results is not None:
+                self.logger.info("Using cached results for page %d", page + 1)
+                all_results.extend(page_results)
+                if self._record_target_hit(keyword, page, page_results):
+                    return all_results
+                if len(page_results) < self.results_per_page:
+                    break
+                continue
+            
+            try:
+                async with self._limiter(CSE_API_URL), session.get(CSE_API_URL, params=params) as response:
+                    if response.status != 200:
+                        self.logger.error("Custom Search API error %s: %s", response.status, await response.text())
+                        break
+                    data = await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.error("Custom Search API request failed on page %d: %s", page + 1, e)
+                break
+            
+            items = data.get('items') or []
+            page_results = []
+            for index_on_page, item in enumerate(items, 1):
+                if item.get('link'):
+                    page_results.append({
+                        'rank': start + index_on_page,
+                        'title': item.get('title') or "No title",
+                        'url': item['link'],
+                        'host': self._result_host(item['link'])
+                    })
+            all_results.extend(page_results)
+            if page_results:
+                self._cache_put(cache_key, page_results)
+            
+            self.logger.info("Found %d organic results on page %d", len(page_results), page + 1)
+            
+            if self._record_target_hit(keyword, page, page_results):
+                return all_results
+            
+            if len(items) < self.results_per_page:
+                self.logger.info("API returned a short page, end of search results")
+                break
+        
+        return all_results
+
+    def _record_target_hit(self, keyword: str, page: int, page_results: List[Dict]) -> bool:
+        """Append the first target match on a page to the CSV; True if one was found."""
+        for result in page_results:
+            if self._is_target_host(result['host']):
+                # Append immediately for reliability
+                try:
+                    self.append_result_to_csv(keyword, result['rank'], page + 1, result['url'])
+                except Exception as e:
+                    self.logger.warning("Append on-find failed: %s", e)
+                self.logger.info("Found target URL at absolute rank %d", result['rank'])
+                return True
+        return False
+
+    def _language(self, keyword: str) -> str:
+        """Return the Google interface language for a keyword (Persian or English)."""
+        if _PERSIAN_RE.search(keyword) is not None:
+            return 'fa'
+        return 'en'
+
+    def _limiter(self, url: str) -> AsyncLimiter:
+        """Return the shared token-bucket limiter for the URL's host."""
+        host = urlparse(url).netloc
+        if host not in self._limiters:
+            max_rate, time_period = RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT)
+            if self._rate_share > 1:
+                # Processes splitting one budget each get an even slice, one request at a time
+                max_rate, time_period = 1, time_period * self._rate_share / max_rate
+            self._limiters[host] = AsyncLimiter(max_rate, time_period)
+        return self._limiters[host]
+
+    async def _fetch(self, url: str, retries: int = 3) -> Tuple[Optional[str], bool]:
+        """Fetch a result page over HTTP; returns (html or None, is_captcha).
+
+        is_captcha only reports the hard signals; captcha text in the HTML is left
+        to the caller, which can tell it apart from a result page that mentions it.
+        """
+        session = await self._ensure_session()
+        for attempt in range(1, retries + 1):
+            try:
+                async with self._limiter(url), session.get(url) as response:
+                    # Google answers suspected bots with a 429 on its /sorry/ captcha page
+                    if response.status == 429 or '/sorry/' in response.url.path:
+                        return None, True
+                    response.raise_for_status()
+                    return await response.text(), False
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.warning("Fetch error (attempt %d/%d) to %s: %s", attempt, retries, url, e)
+                await asyncio.sleep(2 * attempt)
+        return None, False
+
+    async def _solve_in_browser(self, search_url: str, keyword: str) -> Optional[List[Dict]]:
+        """Run the browser fallback off the event loop, holding back other HTTP fetches meanwhile."""
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+            self._http_open = asyncio.Event()
+            self._http_open.set()
+        # One page in the browser at a time; other keywords would only hit the captcha too
+        async with self._browser_lock:
+            self._http_open.clear()
+            try:
+                # The captcha may wait on the user, so keep the loop free for in-flight requests
+                results = await _run_in_daemon_thread(self._browser_fallback, search_url, keyword)
+                if results is not None:
+                    await self._share_browser_cookies()
+                return results
+            except asyncio.CancelledError:
+                # Interrupted (e.g. Ctrl+C): stop the captcha poll instead of waiting on it
+                self._stop_solving.set()
+                raise
+            finally:
+                self._http_open.set()
+
+    async def _share_browser_cookies(self):
+        """Copy the browser's cookies into the HTTP session, so fetches after a solved captcha pass too."""
+        try:
+            cookies = await _run_in_daemon_thread(self.driver.get_cookies)
+        except WebDriverException as e:
+            self.logger.warning("Could not read browser cookies: %s", e)
+            return
+        jar = (await self._ensure_session()).cookie_jar
+        for cookie in cookies:
+            morsel = Morsel()
+            morsel.set(cookie['name'], cookie['value'], cookie['value'])
+            morsel['domain'] = cookie.get('domain', '')
+            morsel['path'] = cookie.get('path', '/')
+            if cookie.get('secure'):
+                morsel['secure'] = True
+            jar.update_cookies([(cookie['name'], morsel)])
+        self.logger.debug("Copied %d browser cookies to the HTTP session", len(cookies))
+
+    def _browser_fallback(self, search_url: str, keyword: str) -> Optional[List[Dict]]:
+        """Load a single captcha- or anti-bot-blocked URL in the browser so it can be solved there."""
+        if webdriver is None:
+            self.logger.warning("Blocked page served over HTTP; install selenium to solve it in the browser")
+            return None
+        if self._browser_failed:
+            self.logger.warning("Blocked page served over HTTP; skipping it, the browser failed to start")
+            return None
+        if self.driver is None:
+            self.logger.warning("Blocked page served over HTTP; opening the browser for this page")
+            try:
+                self.setup_driver()
+            except Exception as e:
+                self._browser_failed = True
+                self.logger.error("Browser fallback unavailable: %s", e)
+                return None
+        return self._search_page_browser(search_url, keyword)
+
+    def _search_page_browser(self, search_url: str, keyword: str) -> Optional[List[Dict]]:
+        """Load a result page in the browser and parse it; None if the page must be skipped."""
+        if not self._load_page(search_url):
+            return None
+        
+        # Wait for the page, returning as soon as results are in; the jitter
+        # after it is for looking human, not for the page load
+        ready = self._wait_for_results()
+        time.sleep(random.uniform(0.3, 0.8))
+        return self._process_page(search_url, keyword, ready=ready)
+    
+    async def _search_page_in_tab(self, search_url: str, keyword: str,
+                                  tab: Optional[str] = None) -> Optional[List[Dict]]:
+        """Like _search_page_browser, but other keywords' tabs are worked on while this page loads."""
+        if not self._load_page(search_url, tab):
+            return None
+        
+        ready = await self._wait_for_results_async(tab)
+        await asyncio.sleep(random.uniform(0.3, 0.8))
+        return self._process_page(search_url, keyword, tab, ready)
+    
+    def _load_page(self, search_url: str, tab: Optional[str] = None) -> bool:
+        """Start loading a result page in the given tab; False if navigation failed."""
+        self._switch_tab(tab)
+        
+        # Navigate to Google search (with retry)
+        if not self._safe_get(search_url):
+            self.logger.error("Failed to navigate after retries; skipping this page")
+            return False
+        return True
     
+    def _process_page(self, search_url: str, keyword: str, tab: Optional[str] = None,
+                      ready: bool = False) -> Optional[List[Dict]]:
+        """Handle consent and captchas on a loaded result page, then parse it.
+
+        ready tells whether the caller's wait already saw the results; the page is
+        only waited on again when a banner or captcha replaced it since.
+        """
+        self._switch_tab(tab)
+        self._humanize_page_interaction()
+
+        # Handle Google consent banner if present (first page attempts)
+        try:
+            reloaded = self._accept_consent_if_present()
+        except Exception as e:
+            self.logger.debug("Consent handling skipped/failed: %s", e)
+            reloaded = False
+        
+        # Check if we got a captcha or anti-bot page
+        if self.is_captcha_page():
+            self.logger.warning("Captcha detected, handling...")
+            reloaded = True
+            if self._captcha_solved:
+                # Captcha is back after a solved one: retry from a clean session before asking again
+                try:
+                    self.reset_session()
+                    self._safe_get(search_url)
+                    # Same wait as after the first load, so the check below sees the new page
+                    self._wait_for_results()
+                except WebDriverException as e:
+                    self.logger.warning("Session reset failed: %s", e)
+            if self.is_captcha_page():
+                if not self.handle_captcha():
+                    self.logger.error("Failed to handle captcha, skipping this page")
+                    return None
+                self._captcha_solved = True
+        elif self.is_anti_bot_page():
+            self.logger.warning("Detected anti-bot page, waiting longer...")
+            reloaded = True
+            time.sleep(random.uniform(10, 20))
+            
+            # Try to click the "click here" link if present
+            try:
+                click_here_link = self.driver.find_element(By.PARTIAL_LINK_TEXT, "click here")
+                if click_here_link:
+                    click_here_link.click()
+                    time.sleep(random.uniform(5, 10))
+            except WebDriverException:
+                pass
+        
+        # Wait for search results to load (resilient); an untouched page already had
+        # the full wait, so it is only checked once more
+        if reloaded:
+            ready = self._wait_for_results()
+        elif not ready:
+            ready = self._results_ready()
+        if not ready:
+            self.logger.warning("Timeout waiting for search results; skipping page")
+            return None
+        
+        # Parse results from current page (organic only)
+        return self.parse_search_results(keyword)
+    
+    def _open_tabs(self, count: int) -> List[str]:
+        """Open browser tabs up to count and return their window handles."""
+        if not self._tabs:
+            self._tabs = [self.driver.current_window_handle]
+        while len(self._tabs) < count:
+            self.driver.switch_to.new_window('tab')
+            self._tabs.append(self.driver.current_window_handle)
+        return self._tabs[:count]
+
+    def _switch_tab(self, tab: Optional[str]):
+        """Focus the given browser tab unless it is already current."""
+        if tab and self.driver.current_window_handle != tab:
+            self.driver.switch_to.window(tab)
+
     def _safe_get(self, url: str, retries: int = 3) -> bool:
         """Navigate to URL with basic retries to survive transient SSL/NET errors."""
+        # With the 'none' load strategy get() returns before the old page is replaced,
+        # so mark it to keep _wait_for_results from accepting its results
+        try:
+            self.driver.execute_script(MARK_STALE_JS)
+        except WebDriverException as e:
+            self.logger.debug("Could not mark the current page: %s", e)
         for attempt in range(1, retries + 1):
             try:
                 self.driver.get(url)
                 return True
+            except TimeoutException:
+                # The page load timeout is only a safety valve; readiness is checked separately
+                return True
             except Exception as e:
-                self.logger.warning(f"Navigation error (attempt {attempt}/{retries}) to {url}: {e}")
+                self.logger.warning("Navigation error (attempt %d/%d) to %s: %s", attempt, retries, url, e)
                 time.sleep(2 * attempt)
         return False
 
+    def reset_session(self):
+        """Clear cookies, cache and Google site storage via CDP instead of restarting the browser.
+
+        Session storage has no origin-level CDP storage type and is left as is.
+        """
+        self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        self.driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+            'origin': 'https://www.google.com',
+            'storageTypes': 'local_storage,indexeddb,service_workers,cache_storage,cookies'
+        })
+        self.logger.info("Browser session reset")
+
     # --------------------------
     # Humanization helpers
     # --------------------------
@@ -341,65 +1018,36 @@ class SeleniumRankingTracker:
     def is_anti_bot_page(self) -> bool:
         """Check if we're on an anti-bot page."""
         try:
-            # Check for common anti-bot indicators
-            anti_bot_indicators = [
-                "If you're having trouble accessing Google Search",
-                "enable JavaScript",
-                "unusual traffic",
-                "captcha",
-                "Please click here",
-                "robot verification",
-                "verify you are human",
-                "security check",
-                "automated queries"
-            ]
-            
-            page_text = self.driver.page_source.lower()
-            return any(indicator.lower() in page_text for indicator in anti_bot_indicators)
-        except:
+            # Check for common anti-bot indicators, reusing the source is_captcha_page fetched
+            return _ANTI_BOT_RE.search(self._page_source(reuse=True)) is not None
+        except WebDriverException:
             return False
     
     def is_captcha_page(self) -> bool:
         """Check if we're on a captcha page."""
         try:
             # Fast textual signals
-            captcha_indicators = [
-                "captcha",
-                "robot verification",
-                "verify you are human",
-                "security check",
-                "recaptcha",
-                "select all images",
-                "i'm not a robot",
-                "are you a robot"
-            ]
-            page_text = self.driver.page_source.lower()
-            if any(indicator in page_text for indicator in captcha_indicators):
+            if self._has_captcha_text(self._page_source()):
                 return True
 
-            # Structural signals: presence of recaptcha/turnstile/hcaptcha iframes/elements
-            try:
-                iframes = self.driver.find_elements(By.TAG_NAME, 'iframe')
-                for f in iframes:
-                    title = (f.get_attribute('title') or '').lower()
-                    src = (f.get_attribute('src') or '').lower()
-                    if ('recaptcha' in title) or ('recaptcha' in src):
-                        return True
-                # Common widget elements
-                widget_candidates = [
-                    (By.ID, 'captcha'), (By.ID, 'g-recaptcha'), (By.CLASS_NAME, 'g-recaptcha'),
-                    (By.CSS_SELECTOR, 'div[role="dialog"][aria-modal="true"]')
-                ]
-                for by, sel in widget_candidates:
-                    els = self.driver.find_elements(by, sel)
-                    if els:
-                        return True
-            except Exception:
-                pass
-            return False
-        except:
+            # Structural signals: presence of recaptcha iframes or common widget elements
+            return bool(self.driver.find_elements(By.CSS_SELECTOR, CAPTCHA_WIDGET_SELECTOR))
+        except WebDriverException:
             return False
     
+    def _page_source(self, reuse: bool = False) -> str:
+        """Return the current page source, optionally reusing the last fetch for the same URL."""
+        current_url = self.driver.current_url
+        if reuse and self._page_source_cache and self._page_source_cache[0] == current_url:
+            return self._page_source_cache[1]
+        page_source = self.driver.page_source
+        self._page_source_cache = (current_url, page_source)
+        return page_source
+
+    def _has_captcha_text(self, html: str) -> bool:
+        """Check page HTML for textual captcha signals."""
+        return _CAPTCHA_RE.search(html) is not None
+
     def handle_captcha(self) -> bool:
         """Handle captcha page by interacting with checkbox or guiding manual solving.
 
@@ -414,6 +1062,11 @@ class SeleniumRankingTracker:
             
             self.logger.warning("CAPTCHA detected! Attempting to handle...")
 
+            # Let the challenge render with its images and styles
+            self._set_resource_blocking(False)
+            self.driver.refresh()
+            time.sleep(1.5)
+
             # Always start from default content
             try:
                 self.driver.switch_to.default_content()
@@ -447,11 +1100,11 @@ class SeleniumRankingTracker:
                         anchor.click()
                         time.sleep(1.5)
                     except Exception as e:
-                        self.logger.debug(f"Checkbox click failed or not present: {e}")
+                        self.logger.debug("Checkbox click failed or not present: %s", e)
                     finally:
                         self.driver.switch_to.default_content()
             except Exception as e:
-                self.logger.debug(f"Error trying checkbox iframe: {e}")
+                self.logger.debug("Error trying checkbox iframe: %s", e)
 
             # Step 2: If a challenge dialog appears, guide user and poll until cleared
             if self.is_captcha_page():
@@ -461,12 +1114,15 @@ class SeleniumRankingTracker:
                 print("If you see an image challenge, solve it in the browser.")
                 print("- Keep the Chrome window visible (not minimized)")
                 print("- Solve the tiles; some challenges auto-verify without a button")
-                print("- When results load, come back here")
-                print("Press ENTER to start polling for completion...")
-                try:
-                    input()
-                except Exception:
-                    pass
+                if self._interactive:
+                    print("- When results load, come back here")
+                    print("Press ENTER to start polling for completion...")
+                    try:
+                        input()
+                    except Exception:
+                        pass
+                else:
+                    print("- This worker checks for the solved captcha on its own")
 
                 # Poll until captcha page is gone or timeout
                 end_time = time.time() + 180  # up to 3 minutes for complex challenges
@@ -478,7 +1134,9 @@ class SeleniumRankingTracker:
                     if not self.is_captcha_page():
                         self.logger.info("Captcha cleared.")
                         break
-                    time.sleep(2.0)
+                    if self._stop_solving.wait(2.0):
+                        self.logger.warning("Captcha handling interrupted")
+                        return False
 
             # Final confirmation and settle time
             self.driver.switch_to.default_content()
@@ -489,8 +1147,17 @@ class SeleniumRankingTracker:
             return True
             
         except Exception as e:
-            self.logger.error(f"Error handling captcha: {e}")
+            self.logger.error("Error handling captcha: %s", e)
             return False
+        finally:
+            try:
+                self._set_resource_blocking(True)
+            except Exception as e:
+                self.logger.warning("Could not restore resource blocking: %s", e)
+
+    def _set_resource_blocking(self, enabled: bool):
+        """Block or unblock heavy subresources (images, fonts, CSS) via CDP."""
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS if enabled else []})
     
     def parse_search_results(self, keyword: str) -> List[Dict]:
         """
@@ -505,136 +1172,195 @@ class SeleniumRankingTracker:
         results = []
         
         try:
-            # Prefer Google's organic result containers first
-            selectors = [
-                "div.tF2Cxc",         # Primary organic result container
-                "div.g",              # Standard container (fallback)
-                "div.MjjYud",         # Wrapper in newer layouts
-                "div[data-ved]",      # Generic results with data-ved
-                "div.rc",             # Legacy container
-            ]
+            # One WebDriver round-trip: the page walks its own DOM and hands back JSON
+            extracted = json.loads(self.driver.execute_script(EXTRACT_RESULTS_JS, ORGANIC_XPATH))
+        except WebDriverException as e:
+            # Still a single round-trip: snapshot the rendered HTML and parse it in-process
+            self.logger.warning("In-page extraction failed, parsing page source instead: %s", e)
+            try:
+                return self._parse_html(self.driver.page_source)
+            except WebDriverException as e:
+                self.logger.error("Error parsing search results: %s", e)
+                return results
+        
+        try:
+            for item in extracted:
+                url = self._clean_result_url(item.get('url') or '')
+                title = item.get('title') or "No title"
+                
+                # Exclude internal Google links and non-http URLs
+                if url.startswith(('http://', 'https://')) and not self._is_google_internal(url):
+                    results.append({
+                        'rank': len(results) + 1,
+                        'title': title,
+                        'url': url,
+                        'host': self._result_host(url)
+                    })
+                    
+                    self.logger.debug("Rank %d: %s", len(results), title)
+                    self.logger.debug("URL: %s", url)
+        
+        except Exception as e:
+            self.logger.error("Error parsing search results: %s", e)
+        
+        return results
+
+    def _parse_html(self, html: str) -> List[Dict]:
+        """
+        Parse organic search results out of raw SERP HTML.
+        
+        Args:
+            html: Result page HTML
             
-            result_elements = []
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        result_elements = elements
-                        self.logger.info(f"Found {len(elements)} results using selector: {selector}")
-                        break
-                except:
+        Returns:
+            List of result dictionaries
+        """
+        results = []
+        seen_urls = set()
+        
+        try:
+            tree = HTMLParser(html)
+            # Containers nest in newer layouts, so the same result can match more than once
+            for element in tree.css(RESULT_SELECTOR):
+                title_element = element.css_first('h3')
+                link_element = element.css_first('a[href]')
+                if title_element is None or link_element is None:
+                    continue
+                if any(span.text(strip=True).lower() in AD_LABELS for span in element.css('span')):
                     continue
-            
-            # Keep elements that look like organic results: have an h3 with an anchor
-            def is_organic_result(el) -> bool:
-                try:
-                    h3 = el.find_elements(By.TAG_NAME, "h3")
-                    if not h3:
-                        return False
-                    a_tags = el.find_elements(By.TAG_NAME, "a")
-                    return len(a_tags) > 0
-                except Exception:
-                    return False
-
-            organic_elements = [el for el in result_elements if is_organic_result(el)]
-
-            for index, element in enumerate(organic_elements, 1):
-                try:
-                    # Extract URL
-                    link_element = element.find_element(By.TAG_NAME, "a")
-                    url = link_element.get_attribute("href")
-                    
-                    if not url:
-                        continue
-                    
-                    # Clean Google redirect URLs
-                    if url.startswith('/url?q='):
-                        url = url.split('/url?q=')[1].split('&')[0]
-                    elif url.startswith('https://www.google.com/url?'):
-                        # Extract actual URL from Google redirect
-                        import urllib.parse
-                        parsed = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
-                        if 'q' in parsed:
-                            url = parsed['q'][0]
-                    
-                    # Extract title
-                    title = "No title"
-                    try:
-                        title_element = element.find_element(By.TAG_NAME, "h3")
-                        title = title_element.text.strip()
-                    except:
-                        try:
-                            title_element = element.find_element(By.TAG_NAME, "h2")
-                            title = title_element.text.strip()
-                        except:
-                            try:
-                                title_element = link_element
-                                title = title_element.text.strip()
-                            except:
-                                pass
-                    
-                    # Exclude internal Google links and non-http URLs
-                    if url and url.startswith(('http://', 'https://')) and not self._is_google_internal(url):
-                        results.append({
-                            'rank': index,
-                            'title': title,
-                            'url': url
-                        })
-                        
-                        self.logger.debug(f"Rank {index}: {title}")
-                        self.logger.debug(f"URL: {url}")
                 
-                except Exception as e:
-                    self.logger.debug(f"Error parsing result {index}: {e}")
+                url = self._clean_result_url(link_element.attributes.get('href') or '')
+                if url in seen_urls:
                     continue
+                
+                # Exclude internal Google links and non-http URLs
+                if url.startswith(('http://', 'https://')) and not self._is_google_internal(url):
+                    seen_urls.add(url)
+                    title = title_element.text(strip=True) or "No title"
+                    results.append({
+                        'rank': len(results) + 1,
+                        'title': title,
+                        'url': url,
+                        'host': self._result_host(url)
+                    })
+                    
+                    self.logger.debug("Rank %d: %s", len(results), title)
+                    self.logger.debug("URL: %s", url)
         
         except Exception as e:
-            self.logger.error(f"Error parsing search results: {e}")
+            self.logger.error("Error parsing search results: %s", e)
         
         return results
+
+    def _clean_result_url(self, url: str) -> str:
+        """Unwrap Google redirect links to the destination URL."""
+        if url.startswith(('/url?', 'https://www.google.com/url?')):
+            # Extract actual URL from Google redirect; parse_qsl percent-decodes it
+            for key, value in parse_qsl(urlsplit(url).query):
+                if key == 'q':
+                    url = value
+                    break
+        return url
+
+    def _result_host(self, url: str) -> str:
+        """Return a result URL's lower-cased, IDNA-encoded host without 'www.'."""
+        try:
+            hostname = urlsplit(url).hostname or ''
+        except ValueError:
+            # Malformed host such as an unbalanced IPv6 bracket; matches no target
+            return ''
+        # Results repeat a handful of hosts, so the normalization is memoized per host
+        return _normalize_host(hostname)
     
-    def find_website_ranking(self, keyword: str) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+    async def find_website_ranking(self, keyword: str,
+                                   tab: Optional[str] = None) -> Tuple[Optional[int], Optional[int], Optional[str]]:
         """
         Find the ranking of the target website for a given keyword.
         
         Args:
             keyword: Search keyword
+            tab: Browser window handle reserved for this keyword (browser mode)
             
         Returns:
             Tuple of (rank, page, url) or (None, None, None) if not found
         """
         try:
-            self.logger.info(f"Searching for keyword: {keyword}")
+            self.logger.info("Searching for keyword: %s", keyword)
             
             # Search Google
-            results = self.search_google(keyword, self.max_pages)
+            if self.use_api:
+                results = await self.search_api(keyword, self.max_pages)
+            else:
+                results = await self.search_google(keyword, self.max_pages, tab)
             
             if not results:
-                self.logger.warning(f"No results found for keyword: {keyword}")
+                self.logger.warning("No results found for keyword: %s", keyword)
                 return None, None, None
             
             # Look for our target URL in results
             for result in results:
-                if self._is_target_url(result['url']):
+                if self._is_target_host(result['host']):
                     rank = result['rank']
                     page = (rank - 1) // self.results_per_page + 1
                     url = result['url']
                     
-                    self.logger.info(f"Found {self.target_url} at rank {rank}, page {page}")
+                    self.logger.info("Found %s at rank %d, page %d", self.target_url, rank, page)
                     
-                    # Append already handled at discovery time; just return
+                    # Append already handled at discovery time
                     return rank, page, url
             
-            self.logger.info(f"Target website not found in first {len(results)} results")
+            self.logger.info("Target website not found in first %d results", len(results))
             return None, None, None
             
         except Exception as e:
-            self.logger.error(f"Error finding ranking for keyword '{keyword}': {e}")
+            self.logger.error("Error finding ranking for keyword '%s': %s", keyword, e)
             return None, None, None
     
-    def track_rankings(self, keywords_file: str = "keywords.txt"):
+    def _open_cache(self):
+        """Open the SERP cache database, creating its table if needed."""
+        os.makedirs(os.path.dirname(SERP_CACHE_FILE), exist_ok=True)
+        self._cache = sqlite3.connect(SERP_CACHE_FILE)
+        self._cache.execute(
+            "CREATE TABLE IF NOT EXISTS serp(key TEXT PRIMARY KEY, fetched_at INTEGER, results BLOB)"
+        )
+        self._cache.commit()
+
+    def _cache_key(self, source: str, keyword: str, page: int) -> str:
+        # A page's results do not depend on the target, so other targets reuse them;
+        # the page size is part of the key since it decides which results a page holds
+        return (f"{source}|{keyword}|{self._language(keyword)}|{page}|{self.results_per_page}"
+                f"|{date.today().isoformat()}")
+
+    def _cache_get(self, key: str) -> Optional[List[Dict]]:
+        """Return a cached result page if still fresh, else None."""
+        if self._cache is None:
+            return None
+        try:
+            row = self._cache.execute(
+                "SELECT results FROM serp WHERE key = ? AND fetched_at > ?",
+                (key, int(time.time()) - SERP_CACHE_TTL)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning("SERP cache read failed: %s", e)
+            return None
+        return json.loads(row[0]) if row else None
+
+    def _cache_put(self, key: str, results: List[Dict]):
+        """Store a parsed result page in the cache."""
+        if self._cache is None:
+            return
+        try:
+            self._cache.execute(
+                "INSERT OR REPLACE INTO serp(key, fetched_at, results) VALUES (?, ?, ?)",
+                (key, int(time.time()), json.dumps(results, ensure_ascii=False))
+            )
+            self._cache.commit()
+        except sqlite3.Error as e:
+            self.logger.warning("SERP cache write failed: %s", e)
+    
+    async def track_rankings(self, keywords_file: str = "keywords.txt"):
         """
-        Track rankings for all keywords in the file.
+        Track rankings for all keywords in the file, several keywords at a time.
         
         Args:
             keywords_file: Path to file containing keywords
@@ -648,75 +1374,122 @@ class SeleniumRankingTracker:
                 self.logger.error("No keywords found in file")
                 return
             
-            self.logger.info(f"Tracking rankings for {len(keywords)} keywords")
+            self.logger.info("Tracking rankings for %d keywords", len(keywords))
             
-            results = []
+            if self.browser and self.workers > 1:
+                rankings = await self._rank_in_processes(keywords)
+            else:
+                rankings = await self._rank_in_tabs(keywords)
             
-            for i, keyword in enumerate(keywords, 1):
-                self.logger.info(f"Processing keyword {i}/{len(keywords)}: {keyword}")
-                
-                rank, page, url = self.find_website_ranking(keyword)
-                
-                results.append({
+            results = [
+                {
                     'Keyword': keyword,
                     'Rank': rank if rank else "N/A",
                     'Page': page if page else "N/A",
                     'URL': url if url else "N/A"
-                })
-                
-                # Random delay between keywords
-                if i < len(keywords):
-                    delay = random.uniform(self.min_delay, self.max_delay)
-                    self.logger.info(f"Waiting {delay:.1f} seconds before next keyword...")
-                    time.sleep(delay)
+                }
+                for keyword, (rank, page, url) in zip(keywords, rankings)
+            ]
             
             # Write results to CSV
             self.write_to_csv(results)
             
-            self.logger.info(f"Tracking completed. Results saved to {self.output_file}")
+            self.logger.info("Tracking completed. Results saved to %s", self.output_file)
             
         except FileNotFoundError:
-            self.logger.error(f"Keywords file not found: {keywords_file}")
+            self.logger.error("Keywords file not found: %s", keywords_file)
         except Exception as e:
-            self.logger.error(f"Error tracking rankings: {e}")
+            self.logger.error("Error tracking rankings: %s", e)
+    
+    async def _rank_in_tabs(self, keywords: List[str]) -> List[Tuple[Optional[int], Optional[int], Optional[str]]]:
+        """Rank keywords concurrently within this process."""
+        # In browser mode each keyword in flight gets its own tab of the one browser;
+        # while one keyword waits for its page to load, another works on its own tab
+        tabs = None
+        if self.browser:
+            tabs = asyncio.Queue()
+            for handle in self._open_tabs(min(self.browser_tabs, len(keywords))):
+                tabs.put_nowait(handle)
+        sem = asyncio.Semaphore(tabs.qsize() if tabs else self.concurrency)
+        
+        async def _one(i: int, keyword: str):
+            async with sem:
+                self.logger.info("Processing keyword %d/%d: %s", i, len(keywords), keyword)
+                
+                tab = await tabs.get() if tabs else None
+                try:
+                    return await self.find_website_ranking(keyword, tab)
+                finally:
+                    if tab:
+                        tabs.put_nowait(tab)
+        
+        return await asyncio.gather(*[_one(i, keyword) for i, keyword in enumerate(keywords, 1)])
+    
+    async def _rank_in_processes(self, keywords: List[str]) -> List[Tuple[Optional[int], Optional[int], Optional[str]]]:
+        """Rank keywords across a pool of processes, each driving its own Chrome."""
+        # Processes rather than threads: a chromedriver session is not thread-safe
+        if webdriver is None:
+            raise RuntimeError("Browser mode requires selenium and webdriver-manager to be installed")
+        self._close_csv()
+        processes = min(self.workers, len(keywords))
+        options = {
+            'target_url': self.target_url,
+            'output_file': self.output_file,
+            'debug_mode': self.debug_mode,
+            'cache': self._cache is not None,
+            # Resolved once here so workers don't each check the cached chromedriver
+            'driver_path': self._resolve_driver_path(),
+        }
+        self.logger.info("Searching with %d browser processes", processes)
+        
+        # Spawned workers start with fresh logging state and exit through atexit
+        context = multiprocessing.get_context('spawn')
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context, initializer=_init_worker,
+                                 initargs=(context.Lock(), options, processes)) as pool:
+            rankings = await asyncio.gather(
+                *[loop.run_in_executor(pool, _worker, keyword) for keyword in keywords],
+                return_exceptions=True
+            )
+        
+        # A failed worker only costs its own keyword
+        for i, (keyword, ranking) in enumerate(zip(keywords, rankings)):
+            if isinstance(ranking, BaseException):
+                self.logger.error("Worker failed for keyword '%s': %r", keyword, ranking)
+                rankings[i] = (None, None, None)
+        return rankings
     
     def append_result_to_csv(self, keyword: str, rank: int, page: int, url: str):
-        """Append a single result to CSV file immediately when found."""
+        """Append a found result to the CSV file right away; a keyword has at most one."""
         try:
-            import os
+            # Rows are pre-encoded with csv's default line terminator
+            row = ','.join(_csv_field(value) for value in (keyword, rank, page, url))
+            # Open once on first append; the header and directory are handled at that point
+            if self._csv_fh is None:
+                self._ensure_csv_header()
+                self._csv_fh = open(self.output_file, 'ab')
+            # Worker processes share the file, so each row goes out under their common lock
+            with self._csv_lock or contextlib.nullcontext():
+                self._csv_fh.write(row.encode('utf-8') + b'\r\n')
+                self._csv_fh.flush()
             
-            # Check if file exists and has header
-            file_exists = os.path.exists(self.output_file)
-            # Ensure parent directory exists
-            out_dir = os.path.dirname(self.output_file)
-            if out_dir and not os.path.isdir(out_dir):
-                os.makedirs(out_dir, exist_ok=True)
-            
-            with open(self.output_file, 'a', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['Keyword', 'Rank', 'Page', 'URL']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                # Write header if file doesn't exist
-                if not file_exists:
-                    writer.writeheader()
-                
-                # Write the result
-                writer.writerow({
-                    'Keyword': keyword,
-                    'Rank': rank,
-                    'Page': page,
-                    'URL': url
-                })
-            
-            self.logger.info(f"✅ Result appended to {self.output_file}: {keyword} -> Rank {rank}")
+            self.logger.info("✅ Result appended to %s: %s -> Rank %s", self.output_file, keyword, rank)
             print(f"✅ FOUND: {keyword} at rank {rank}, page {page} -> Appended to CSV")
             
         except Exception as e:
-            self.logger.error(f"Error appending to CSV: {e}")
+            self.logger.error("Error appending to CSV: %s", e)
+
+    def _close_csv(self):
+        """Close the incremental CSV handle."""
+        if self._csv_fh is not None:
+            try:
+                self._csv_fh.close()
+            except OSError as e:
+                self.logger.warning("Error closing CSV file: %s", e)
+            self._csv_fh = None
 
     def _ensure_csv_header(self):
         """Create output CSV with header if not present."""
-        import os
         # Ensure parent directory exists
         out_dir = os.path.dirname(self.output_file)
         if out_dir and not os.path.isdir(out_dir):
@@ -727,65 +1500,63 @@ class SeleniumRankingTracker:
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                 writer.writeheader()
 
-    def _normalize_host(self, host: str) -> str:
-        host = host.strip().lower()
-        if host.startswith('http://') or host.startswith('https://'):
-            host = urlparse(host).netloc
-        if host.startswith('www.'):
-            host = host[4:]
-        try:
-            host = host.encode('idna').decode('ascii')
-        except Exception:
-            pass
-        return host
-
     def _is_google_internal(self, url: str) -> bool:
         try:
-            netloc = urlparse(url).netloc.lower()
-            return '.google.' in netloc
-        except Exception:
+            return '.google.' in urlsplit(url).netloc.lower()
+        except ValueError:
+            # Malformed host such as an unbalanced IPv6 bracket
             return False
 
-    def _is_target_url(self, url: str) -> bool:
-        try:
-            target_host = self._normalize_host(self.target_url)
-            url_host = self._normalize_host(url)
-            return url_host.endswith(target_host)
-        except Exception:
-            return False
+    def _is_target_host(self, host: str) -> bool:
+        # Exact host or a subdomain; 'notexample.com' does not match 'example.com'
+        return host == self._target_host or host.endswith('.' + self._target_host)
 
-    def _accept_consent_if_present(self):
-        """Click Google consent/agree buttons if they appear."""
+    def _accept_consent_if_present(self) -> bool:
+        """Click Google consent/agree buttons if they appear; True if one was clicked."""
         try:
-            # Common selectors/texts for consent banners
-            candidates = [
-                (By.CSS_SELECTOR, 'button[aria-label="Accept all"]'),
-                (By.XPATH, "//button[contains(., 'I agree') or contains(., 'Accept all')]")
-            ]
-            for by, sel in candidates:
-                elems = self.driver.find_elements(by, sel)
-                if elems:
-                    try:
-                        elems[0].click()
-                        time.sleep(1)
-                        return
-                    except Exception:
-                        continue
-        except Exception:
+            for button in self.driver.find_elements(By.XPATH, CONSENT_BUTTON_XPATH):
+                try:
+                    button.click()
+                    time.sleep(1)
+                    return True
+                except WebDriverException:
+                    continue
+        except WebDriverException:
             pass
+        return False
+
+    def _wait_for_results(self, timeout: int = 15) -> bool:
+        """Wait until organic containers likely present, polling in-page every 100 ms."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._results_ready():
+                return True
+            time.sleep(0.1)
+        return False
+
+    async def _wait_for_results_async(self, tab: Optional[str], timeout: int = 15) -> bool:
+        """Like _wait_for_results, but yields to other keywords between polls."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            # Other keywords may have switched tabs while this one was waiting
+            self._switch_tab(tab)
+            if self._results_ready():
+                return True
+            await asyncio.sleep(0.1)
+        return False
 
-    def _wait_for_results(self, timeout: int = 20) -> bool:
-        """Wait until organic containers likely present."""
+    def _results_ready(self) -> bool:
+        """Check once whether the current tab shows a freshly loaded result page."""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div.g, div.tF2Cxc, div.MjjYud'))
-            )
-            return True
-        except TimeoutException:
+            return bool(self.driver.execute_script(RESULTS_READY_JS, RESULT_SELECTOR, list(NO_RESULTS_INDICATORS)))
+        except WebDriverException as e:
+            self.logger.debug("Readiness check failed: %s", e)
             return False
     
     def write_to_csv(self, data: List[Dict]):
         """Write results to CSV file."""
+        # The summary replaces the incremental file, so release the append handle first
+        self._close_csv()
         try:
             with open(self.output_file, 'w', newline='', encoding='utf-8') as csvfile:
                 fieldnames = ['Keyword', 'Rank', 'Page', 'URL']
@@ -795,21 +1566,91 @@ class SeleniumRankingTracker:
                 for row in data:
                     writer.writerow(row)
             
-            self.logger.info(f"Results written to {self.output_file}")
+            self.logger.info("Results written to %s", self.output_file)
             
         except Exception as e:
-            self.logger.error(f"Error writing to CSV: {e}")
+            self.logger.error("Error writing to CSV: %s", e)
     
+    async def aclose(self):
+        """Close the pooled HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     def cleanup(self):
         """Clean up resources."""
+        self._close_csv()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
         if self.driver:
             try:
                 self.driver.quit()
             except Exception as e:
-                self.logger.warning(f"Error during driver quit: {e}")
+                self.logger.warning("Error during driver quit: %s", e)
             self.logger.info("WebDriver closed")
 
 
+# State of a browser worker process, set by _init_worker
+_csv_lock = None
+_worker_options: Dict = {}
+_worker_rate_share = 1
+_worker_tracker: Optional[SeleniumRankingTracker] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker(lock, options: Dict, rate_share: int):
+    """Keep the shared CSV lock and the tracker settings in a new worker process."""
+    global _csv_lock, _worker_options, _worker_rate_share, _worker_loop
+    _csv_lock = lock
+    _worker_options = options
+    _worker_rate_share = rate_share
+    # One loop for the process's lifetime; the tracker's limiters and locks are bound to it
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    atexit.register(_close_worker_loop)
+
+
+def _close_worker_loop():
+    """Close the worker's HTTP session and event loop at process exit."""
+    if _worker_tracker is not None:
+        _worker_loop.run_until_complete(_worker_tracker.aclose())
+    _worker_loop.close()
+
+
+def _worker(keyword: str) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+    """Rank one keyword with this process's tracker, starting its browser on first use."""
+    global _worker_tracker
+    if _worker_tracker is None:
+        tracker = SeleniumRankingTracker(browser=True, **_worker_options)
+        tracker._csv_lock = _csv_lock
+        tracker._rate_share = _worker_rate_share
+        tracker._interactive = False
+        # Quit the browser when the pool shuts the process down
+        atexit.register(tracker.cleanup)
+        _worker_tracker = tracker
+    _worker_tracker.logger.info("Processing keyword: %s", keyword)
+    return _worker_loop.run_until_complete(_worker_tracker.find_website_ranking(keyword))
+
+
+async def _run(args):
+    """Run a tracking session, releasing the HTTP pool and browser on exit."""
+    tracker = None
+    try:
+        # Initialize tracker
+        tracker = SeleniumRankingTracker(args.url, args.output, args.debug, browser=args.browser,
+                                         refresh_driver=args.refresh_driver, api=args.api,
+                                         cache=not args.no_cache, workers=args.workers)
+        
+        # Start tracking
+        await tracker.track_rankings(args.keywords)
+        
+    finally:
+        if tracker:
+            await tracker.aclose()
+            tracker.cleanup()
+
+
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(description='Selenium-based Google Search Ranking Tracker')
@@ -818,27 +1659,28 @@ def main():
     parser.add_argument('--output', default='selenium_results.csv', help='Output CSV file')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--browser', action='store_true',
+                        help='Use a real Chrome browser instead of HTTP requests (e.g. to solve captchas)')
+    parser.add_argument('--api', action='store_true',
+                        help='Use the Google Custom Search JSON API (needs GOOGLE_CSE_KEY and GOOGLE_CSE_CX)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore and do not update the on-disk SERP cache')
+    parser.add_argument('--refresh-driver', action='store_true',
+                        help='Re-resolve ChromeDriver instead of using the cached path')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of Chrome processes to run in parallel (browser mode)')
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    tracker = None
     try:
-        # Initialize tracker
-        tracker = SeleniumRankingTracker(args.url, args.output, args.debug)
-        
-        # Start tracking
-        tracker.track_rankings(args.keywords)
-        
+        asyncio.run(_run(args))
     except KeyboardInterrupt:
         print("\nTracking interrupted by user")
     except Exception as e:
         print(f"Error: {e}")
-    finally:
-        if tracker:
-            tracker.cleanup()
 
 
 if __name__ == "__main__":